@@ -1,32 +1,69 @@
 import requests
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Optional
 
 class SemanticScholarApiClient:
     BASE_URL = "https://api.semanticscholar.org/graph/v1"
+    # The most IDs the batch endpoint accepts in one request
+    BATCH_SIZE = 500
+    # Always requested, since every Paper needs them
+    REQUIRED_FIELDS = ("paperId", "corpusId", "title")
+    # Maps the optional fields callers can ask for to Semantic Scholar field names
+    OPTIONAL_FIELDS = {
+        "abstract": ("abstract",),
+        "year": ("year",),
+        "authors": ("authors.name", "authors.authorId"),
+    }
 
     def __init__(self, max_retries: int = 6, initial_delay: float = 2.0, backoff_factor: float = 3.0):
         self.max_retries = max_retries
         self.initial_delay = initial_delay
         self.backoff_factor = backoff_factor
 
-    def search_papers(self, query: str, limit: int = 10) -> Dict[str, Any]:
+    def search_papers(self, query: str, limit: int = 10, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Search for papers, requesting only the given optional fields (all of them if fields is None).
+        """
         endpoint = f"{self.BASE_URL}/paper/search"
         params = {
             "query": query,
             "limit": limit,
-            "fields": "paperId,corpusId,title,abstract,year,authors.name,authors.authorId"
+            "fields": self._fields_param(fields)
         }
 
         return self._make_request("GET", endpoint, params)
 
-    def _make_request(self, method: str, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    def get_papers(self, corpus_ids: List[int], fields: Optional[Iterable[str]] = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        Fetch several papers by corpus ID, in as few requests as the batch size allows.
+        Entries are None for IDs the API does not know.
+        """
+        endpoint = f"{self.BASE_URL}/paper/batch"
+        params = {"fields": self._fields_param(fields)}
+        papers = []
+        for start in range(0, len(corpus_ids), self.BATCH_SIZE):
+            batch = corpus_ids[start:start + self.BATCH_SIZE]
+            body = {"ids": [f"CorpusId:{corpus_id}" for corpus_id in batch]}
+            papers.extend(self._make_request("POST", endpoint, params, body))
+        return papers
+
+    def _fields_param(self, fields: Optional[Iterable[str]]) -> str:
+        if fields is None:
+            fields = self.OPTIONAL_FIELDS.keys()
+        api_fields = list(self.REQUIRED_FIELDS)
+        for field in fields:
+            if field not in self.OPTIONAL_FIELDS:
+                raise ValueError(f"Unknown field {field!r}; expected some of {list(self.OPTIONAL_FIELDS)}")
+            api_fields.extend(self.OPTIONAL_FIELDS[field])
+        return ",".join(api_fields)
+
+    def _make_request(self, method: str, url: str, params: Dict[str, Any], json: Any = None) -> Any:
         delay = self.initial_delay
 
         for attempt in range(self.max_retries):
             try:
                 print(f"Making request to {url} (attempt {attempt+1}/{self.max_retries})")
-                response = requests.request(method, url, params=params)
+                response = requests.request(method, url, params=params, json=json)
                 response.raise_for_status()
                 print(f"Request successful")
                 return response.json()
@@ -39,4 +76,4 @@ class SemanticScholarApiClient:
                     time.sleep(delay)
                     delay *= self.backoff_factor  # Exponential backoff
                 else:
-                    raise
\ No newline at end of file
+                    raise
@@ -1,4 +1,4 @@
-from typing import List, Optional, Dict, Tuple
+from typing import Iterable, List, Optional, Dict, Tuple
 from semantic_scholar.domain.paper import Paper
 from semantic_scholar.domain.paper_id import PaperId
 from semantic_scholar.domain.author import Author
@@ -9,23 +9,26 @@ class CachedPaperRepository(PaperRepository):
         self.api_repository = api_repository
         self.db_repository = db_repository
 
-    def search_papers(self, query: str, limit: int = 10) -> List[Paper]:
+    def search_papers(self, query: str, limit: int = 10, fields: Optional[Iterable[str]] = None) -> List[Paper]:
         # The base PaperRepository.search_papers now handles saving papers
-        return self.api_repository.search_papers(query, limit)
+        return self.api_repository.search_papers(query, limit, fields)
 
     def save_papers(self, papers: List[Paper], paper_ids: Dict[int, List[Tuple[str, bool]]] = None,
-                   authors: Dict[int, List[Tuple[str, str, int]]] = None) -> None:
-        self.db_repository.save_papers(papers, paper_ids, authors)
+                   authors: Dict[int, List[Tuple[str, str, int]]] = None) -> Optional[str]:
+        return self.db_repository.save_papers(papers, paper_ids, authors)
 
-    def get_paper_by_id(self, paper_id: str) -> Optional[Paper]:
-        paper = self.db_repository.get_paper_by_id(paper_id)
+    def read_after(self, lsn: Optional[str]):
+        return self.db_repository.read_after(lsn)
+
+    def get_paper_by_id(self, paper_id: str, fields: Optional[Iterable[str]] = None) -> Optional[Paper]:
+        paper = self.db_repository.get_paper_by_id(paper_id, fields)
         if paper is None:
             # Could add API fallback here if needed
             return None
         return paper
 
-    def get_paper_by_corpus_id(self, corpus_id: int) -> Optional[Paper]:
-        paper = self.db_repository.get_paper_by_corpus_id(corpus_id)
+    def get_paper_by_corpus_id(self, corpus_id: int, fields: Optional[Iterable[str]] = None) -> Optional[Paper]:
+        paper = self.db_repository.get_paper_by_corpus_id(corpus_id, fields)
         if paper is None:
             # Could add API fallback here if needed
             return None
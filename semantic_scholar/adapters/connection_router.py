@@ -0,0 +1,230 @@
+import threading
+import time
+import psycopg2
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+from semantic_scholar.config import DatabaseConfig
+
+PRIMARY_LSN_QUERY = "SELECT pg_current_wal_lsn()::text"
+REPLAY_LSN_QUERY = "SELECT pg_last_wal_replay_lsn()::text"
+# Replication status of a replica. The WAL receiver columns are only visible
+# to superusers and roles with pg_read_all_stats; without them a standby is
+# treated as disconnected and reads fall back to the primary.
+REPLICA_STATUS_QUERY = """
+    SELECT pg_is_in_recovery(),
+           pg_last_wal_replay_lsn()::text,
+           EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()),
+           r.status
+    FROM (SELECT 1) AS one
+    LEFT JOIN pg_stat_wal_receiver r ON true
+"""
+
+# The primary's WAL position after this context's last write, keyed by the
+# primary's DSN. Reads in the same context (thread, task or request) through a
+# router for that primary only use replicas that have replayed it.
+_read_after_lsns: ContextVar[Dict[str, str]] = ContextVar('read_after_lsns', default={})
+
+
+def parse_lsn(lsn: Optional[str]) -> Optional[int]:
+    """Convert a Postgres LSN such as '16/B374D848' to an integer for comparison."""
+    if lsn is None:
+        return None
+    high, low = lsn.split('/')
+    return (int(high, 16) << 32) | int(low, 16)
+
+
+@dataclass
+class ReplicaState:
+    dsn: str
+    lag: Optional[float] = None  # Seconds, as of checked_at
+    replay_lsn: Optional[int] = None  # None if the server is not a standby
+    checked_at: float = 0.0
+    down_until: float = 0.0
+
+
+class ConnectionRouter:
+    def __init__(self, config: DatabaseConfig, clock: Callable[[], float] = time.monotonic,
+                 connect: Callable = psycopg2.connect):
+        """
+        Route writes to the primary and spread reads over the replicas in config.
+
+        Reads fall back to the primary when every replica is down or lagging by more
+        than config.max_replica_lag. After a write, reads in the same context only use
+        replicas that have replayed it, so a caller reads its own writes.
+        """
+        self._config = config
+        self._clock = clock
+        self._connect = connect
+        self._replicas = [ReplicaState(dsn) for dsn in config.replica_dsns]
+        self._next_replica = 0
+        self._primary_lsn = None
+        self._primary_lsn_checked_at = None
+        self._lock = threading.Lock()
+
+    def connect_write(self):
+        return self._connect(self._config.dsn)
+
+    def record_write(self, conn) -> str:
+        """
+        Note that a write has been committed on conn, a primary connection.
+        Returns the primary's WAL position, which later reads in this context wait for.
+        """
+        with conn.cursor() as cur:
+            cur.execute(PRIMARY_LSN_QUERY)
+            lsn = cur.fetchone()[0]
+        conn.commit()
+        self._set_read_after(lsn)
+        return lsn
+
+    @contextmanager
+    def read_after(self, lsn: Optional[str]):
+        """Within the block, only read from replicas that have replayed lsn."""
+        token = self._set_read_after(lsn)
+        try:
+            yield
+        finally:
+            _read_after_lsns.reset(token)
+
+    def _set_read_after(self, lsn: Optional[str]):
+        # The dict in the context variable is never mutated, so copied contexts stay independent
+        lsns = dict(_read_after_lsns.get())
+        if lsn is None:
+            lsns.pop(self._config.dsn, None)
+        else:
+            lsns[self._config.dsn] = lsn
+        return _read_after_lsns.set(lsns)
+
+    def _read_after(self) -> Optional[int]:
+        return parse_lsn(_read_after_lsns.get().get(self._config.dsn))
+
+    def connect_read(self):
+        for replica in self._read_candidates():
+            conn = self._connect_replica(replica)
+            if conn is not None:
+                return conn
+        return self._connect(self._config.dsn)
+
+    def _read_candidates(self) -> List[ReplicaState]:
+        with self._lock:
+            if not self._replicas:
+                return []
+            now = self._clock()
+
+            # Round-robin: start one replica further along on each read
+            start = self._next_replica
+            self._next_replica = (start + 1) % len(self._replicas)
+            ordered = self._replicas[start:] + self._replicas[:start]
+
+            return [
+                replica for replica in ordered
+                if replica.down_until <= now and not self._known_lagging(replica, now)
+            ]
+
+    def _known_lagging(self, replica: ReplicaState, now: float) -> bool:
+        return not self._check_due(replica, now) and replica.lag > self._config.max_replica_lag
+
+    def _check_due(self, replica: ReplicaState, now: float) -> bool:
+        return replica.lag is None or now - replica.checked_at >= self._config.replica_check_interval
+
+    def _mark_down(self, replica: ReplicaState) -> None:
+        with self._lock:
+            replica.down_until = self._clock() + self._config.replica_check_interval
+
+    def _connect_replica(self, replica: ReplicaState):
+        try:
+            conn = self._connect(replica.dsn)
+        except psycopg2.OperationalError as e:
+            print(f"Replica unavailable, skipping it for {self._config.replica_check_interval} seconds: {e}")
+            self._mark_down(replica)
+            return None
+
+        try:
+            with self._lock:
+                check_due = self._check_due(replica, self._clock())
+            if check_due:
+                self._check_replica(conn, replica)
+
+            with self._lock:
+                usable = replica.lag <= self._config.max_replica_lag
+            if usable and not self._has_replayed(conn, replica, self._read_after()):
+                usable = False
+        except psycopg2.Error:
+            conn.close()
+            self._mark_down(replica)
+            return None
+
+        if not usable:
+            conn.close()
+            return None
+        return conn
+
+    def _check_replica(self, conn, replica: ReplicaState) -> None:
+        primary_lsn = self._current_primary_lsn()
+        with conn.cursor() as cur:
+            cur.execute(REPLICA_STATUS_QUERY)
+            in_recovery, replay_lsn, replay_age, receiver_status = cur.fetchone()
+        conn.rollback()
+
+        replay_lsn = parse_lsn(replay_lsn)
+        if not in_recovery:
+            # Not a standby: a wrong DSN or a promoted server that may have diverged.
+            # Only a configured standalone copy, as used in tests, is read from.
+            lag = 0.0 if self._config.allow_standalone_replicas else float('inf')
+        elif receiver_status != 'streaming':
+            # Lost contact with the primary: whatever it replayed may be stale.
+            # The receipt time is not checked, since an idle primary only sends
+            # keepalives every wal_receiver_timeout / 2.
+            lag = float('inf')
+        elif primary_lsn is not None and replay_lsn is not None and replay_lsn >= primary_lsn:
+            lag = 0.0
+        else:
+            lag = float('inf') if replay_age is None else float(replay_age)
+
+        with self._lock:
+            replica.lag = lag
+            replica.replay_lsn = replay_lsn
+            replica.checked_at = self._clock()
+
+    def _current_primary_lsn(self) -> Optional[int]:
+        # Fetched at most once per check interval, shared by all replica checks
+        with self._lock:
+            now = self._clock()
+            if (self._primary_lsn_checked_at is not None
+                    and now - self._primary_lsn_checked_at < self._config.replica_check_interval):
+                return self._primary_lsn
+        try:
+            conn = self._connect(self._config.dsn)
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(PRIMARY_LSN_QUERY)
+                    lsn = parse_lsn(cur.fetchone()[0])
+            finally:
+                conn.close()
+        except psycopg2.Error:
+            # Judge replicas on their own replication status alone
+            lsn = None
+        with self._lock:
+            self._primary_lsn = lsn
+            self._primary_lsn_checked_at = now
+        return lsn
+
+    def _has_replayed(self, conn, replica: ReplicaState, lsn: Optional[int]) -> bool:
+        if lsn is None:
+            return True
+        with self._lock:
+            replay_lsn = replica.replay_lsn
+        if replay_lsn is None:
+            # A server that does not replay the primary's WAL never sees its writes
+            return False
+        if replay_lsn >= lsn:
+            return True
+
+        with conn.cursor() as cur:
+            cur.execute(REPLAY_LSN_QUERY)
+            replay_lsn = parse_lsn(cur.fetchone()[0])
+        conn.rollback()
+        with self._lock:
+            replica.replay_lsn = replay_lsn
+        return replay_lsn is not None and replay_lsn >= lsn
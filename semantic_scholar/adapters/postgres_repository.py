@@ -1,13 +1,15 @@
 import psycopg2
 from psycopg2.extras import RealDictCursor
-from typing import List, Optional, Dict, Tuple
+from typing import Any, Iterable, List, Optional, Dict, Tuple
 from contextlib import contextmanager
-from semantic_scholar.domain.paper import Paper
+from semantic_scholar.domain.paper import Paper, DEFERRABLE_FIELDS, defer_fields
 from semantic_scholar.domain.paper_id import PaperId
 from semantic_scholar.domain.author import Author
 from semantic_scholar.domain.wrote import Wrote
-from semantic_scholar.ports.paper_repository import PaperRepository
+from semantic_scholar.ports.paper_repository import PaperRepository, validate_fields
 from semantic_scholar.config import DatabaseConfig
+from semantic_scholar.adapters.schema_migrator import SchemaMigrator
+from semantic_scholar.adapters.connection_router import ConnectionRouter
 
 class PostgresPaperRepository(PaperRepository):
     def __init__(self, config: DatabaseConfig):
@@ -15,75 +17,33 @@ class PostgresPaperRepository(PaperRepository):
         Initialize with a DatabaseConfig instance
         """
         self._config = config  # Store config as instance variable
-        self._init_db()
+        self._router = ConnectionRouter(config)
+        self._check_schema()
 
     @contextmanager
     def _get_connection(self):
-        conn = psycopg2.connect(self._config.dsn)  # Use the stored config
+        # Connection to the primary, for writes
+        conn = self._router.connect_write()
         try:
             yield conn
         finally:
             conn.close()
 
-    def _init_db(self):
-        with self._get_connection() as conn:
-            with conn.cursor() as cur:
-                # Create papers table with corpus_id as primary key
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS papers (
-                        corpus_id BIGINT PRIMARY KEY,
-                        title TEXT NOT NULL,
-                        abstract TEXT,
-                        year INTEGER,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-
-                # Create paperids table to store paper ID mappings
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS paperids (
-                        sha TEXT NOT NULL,
-                        corpus_id BIGINT NOT NULL,
-                        is_primary BOOLEAN NOT NULL,
-                        CONSTRAINT paperids_pk UNIQUE (sha),
-                        FOREIGN KEY (corpus_id) REFERENCES papers(corpus_id) ON DELETE CASCADE
-                    )
-                """)
-
-                # Create authors table
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS authors (
-                        author_id TEXT PRIMARY KEY,
-                        name TEXT NOT NULL
-                    )
-                """)
+    @contextmanager
+    def _get_read_connection(self):
+        # Connection to a replica if one is available and current, otherwise the primary
+        conn = self._router.connect_read()
+        try:
+            yield conn
+        finally:
+            conn.close()
 
-                # Create wrote table for the many-to-many relationship
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS wrote (
-                        author_id TEXT NOT NULL,
-                        corpus_id BIGINT NOT NULL,
-                        position INTEGER NOT NULL,
-                        PRIMARY KEY (author_id, corpus_id),
-                        FOREIGN KEY (author_id) REFERENCES authors(author_id) ON DELETE CASCADE,
-                        FOREIGN KEY (corpus_id) REFERENCES papers(corpus_id) ON DELETE CASCADE
-                    )
-                """)
-
-                # Create indexes for efficient lookups
-                cur.execute("""
-                    CREATE INDEX IF NOT EXISTS paperids_corpus_id_idx ON paperids (corpus_id)
-                """)
-                cur.execute("""
-                    CREATE INDEX IF NOT EXISTS wrote_author_id_idx ON wrote (author_id)
-                """)
-                cur.execute("""
-                    CREATE INDEX IF NOT EXISTS wrote_corpus_id_idx ON wrote (corpus_id)
-                """)
-            conn.commit()
+    def _check_schema(self):
+        # Tables are created by running the migrations, not on every construction
+        SchemaMigrator(self._config).check()
 
     def save_papers(self, papers: List[Paper], paper_ids: Dict[int, List[Tuple[str, bool]]] = None,
-                   authors: Dict[int, List[Tuple[str, str, int]]] = None) -> None:
+                   authors: Dict[int, List[Tuple[str, str, int]]] = None) -> Optional[str]:
         """
         Save papers and their associated paper IDs and authors.
 
@@ -91,25 +51,24 @@ class PostgresPaperRepository(PaperRepository):
             papers: List of Paper objects to save
             paper_ids: Dictionary mapping corpus_id to a list of (sha, is_primary) tuples
             authors: Dictionary mapping corpus_id to a list of (author_id, name, position) tuples
+
+        Returns:
+            The primary's WAL position after the write. Later reads in the same context
+            wait for it automatically; pass it to read_after() to read the write elsewhere.
         """
         with self._get_connection() as conn:
             with conn.cursor() as cur:
                 for paper in papers:
-                    # Insert or update the paper
-                    cur.execute("""
-                        INSERT INTO papers (corpus_id, title, abstract, year)
-                        VALUES (%s, %s, %s, %s)
+                    # Insert or update the paper, leaving deferred fields that were never loaded untouched
+                    deferred = paper.deferred_fields()
+                    columns = ['corpus_id', 'title'] + [f for f in DEFERRABLE_FIELDS if f not in deferred]
+                    cur.execute(f"""
+                        INSERT INTO papers ({', '.join(columns)})
+                        VALUES ({', '.join(['%s'] * len(columns))})
                         ON CONFLICT (corpus_id)
                         DO UPDATE SET
-                            title = EXCLUDED.title,
-                            abstract = EXCLUDED.abstract,
-                            year = EXCLUDED.year
-                    """, (
-                        paper.corpus_id,
-                        paper.title,
-                        paper.abstract,
-                        paper.year
-                    ))
+                            {', '.join(f'{column} = EXCLUDED.{column}' for column in columns[1:])}
+                    """, [getattr(paper, column) for column in columns])
 
                     # If paper_ids are provided, save them
                     if paper_ids and paper.corpus_id in paper_ids:
@@ -144,12 +103,17 @@ class PostgresPaperRepository(PaperRepository):
                                     position = EXCLUDED.position
                             """, (author_id, paper.corpus_id, position))
             conn.commit()
+            return self._router.record_write(conn)
+
+    def read_after(self, lsn: Optional[str]):
+        """Context manager: reads inside it only use replicas that have replayed lsn."""
+        return self._router.read_after(lsn)
 
-    def get_paper_by_id(self, paper_id: str) -> Optional[Paper]:
+    def get_paper_by_id(self, paper_id: str, fields: Optional[Iterable[str]] = None) -> Optional[Paper]:
         """
         Retrieve a paper by its paper ID (sha).
         """
-        with self._get_connection() as conn:
+        with self._get_read_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 # First, find the corpus_id for this paper_id
                 cur.execute(
@@ -161,32 +125,62 @@ class PostgresPaperRepository(PaperRepository):
                 if paper_id_row is None:
                     return None
 
-                # Then, get the paper with this corpus_id
-                return self.get_paper_by_corpus_id(paper_id_row['corpus_id'])
+                # Then, get the paper with this corpus_id on the same connection
+                return self._fetch_paper(cur, paper_id_row['corpus_id'], self._paper_columns(fields))
 
-    def get_paper_by_corpus_id(self, corpus_id: int) -> Optional[Paper]:
+    def get_paper_by_corpus_id(self, corpus_id: int, fields: Optional[Iterable[str]] = None) -> Optional[Paper]:
         """Retrieve a paper by its corpus ID."""
-        with self._get_connection() as conn:
+        fields = self._paper_columns(fields)
+        with self._get_read_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                return self._fetch_paper(cur, corpus_id, fields)
+
+    def _fetch_paper(self, cur, corpus_id: int, fields: List[str]) -> Optional[Paper]:
+        cur.execute(
+            f"SELECT {self._select_columns(fields)} FROM papers WHERE corpus_id = %s",
+            (corpus_id,)
+        )
+        row = cur.fetchone()
+
+        if row is None:
+            return None
+
+        papers = [self._row_to_paper(row, fields)]
+        defer_fields(papers, fields, self._fetch_paper_fields)
+        return papers[0]
+
+    def _paper_columns(self, fields: Optional[Iterable[str]]) -> List[str]:
+        # Authors live in their own tables, so 'authors' has no column here.
+        # Validated against PAPER_FIELDS, so the names are safe to interpolate.
+        return [field for field in validate_fields(fields) if field in DEFERRABLE_FIELDS]
+
+    def _select_columns(self, fields: List[str]) -> str:
+        return ', '.join(['corpus_id', 'title'] + fields)
+
+    def _row_to_paper(self, row, fields: List[str]) -> Paper:
+        return Paper(
+            corpus_id=row['corpus_id'],
+            title=row['title'],
+            **{field: row[field] for field in fields}
+        )
+
+    def _fetch_paper_fields(self, corpus_ids: List[int], fields: List[str]) -> Dict[int, Dict[str, Any]]:
+        """Fetch deferred fields for a batch of papers, keyed by corpus ID."""
+        fields = self._paper_columns(fields)
+        with self._get_read_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute(
-                    "SELECT * FROM papers WHERE corpus_id = %s",
-                    (corpus_id,)
-                )
-                row = cur.fetchone()
-
-                if row is None:
-                    return None
-
-                return Paper(
-                    corpus_id=row['corpus_id'],
-                    title=row['title'],
-                    abstract=row['abstract'],
-                    year=row['year']
+                    f"SELECT corpus_id, {', '.join(fields)} FROM papers WHERE corpus_id = ANY(%s)",
+                    (list(corpus_ids),)
                 )
+                return {
+                    row['corpus_id']: {field: row[field] for field in fields}
+                    for row in cur.fetchall()
+                }
 
     def get_authors_for_paper(self, corpus_id: int) -> List[Author]:
         """Get all authors for a paper, ordered by their position."""
-        with self._get_connection() as conn:
+        with self._get_read_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute("""
                     SELECT a.author_id, a.name, w.position
@@ -206,7 +200,7 @@ class PostgresPaperRepository(PaperRepository):
 
     def get_paper_ids(self, corpus_id: int) -> List[PaperId]:
         """Get all paper IDs associated with a corpus ID."""
-        with self._get_connection() as conn:
+        with self._get_read_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute(
                     "SELECT * FROM paperids WHERE corpus_id = %s",
@@ -222,21 +216,18 @@ class PostgresPaperRepository(PaperRepository):
                     ) for row in rows
                 ]
 
-    def search_papers(self, query: str, limit: int = 10) -> List[Paper]:
-        with self._get_connection() as conn:
+    def search_papers(self, query: str, limit: int = 10, fields: Optional[Iterable[str]] = None) -> List[Paper]:
+        fields = self._paper_columns(fields)
+        with self._get_read_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT * FROM papers
+                cur.execute(f"""
+                    SELECT {self._select_columns(fields)} FROM papers
                     WHERE to_tsvector('english', title || ' ' || COALESCE(abstract, '')) @@ plainto_tsquery('english', %s)
                     LIMIT %s
                 """, (query, limit))
 
-                return [
-                    Paper(
-                        corpus_id=row['corpus_id'],
-                        title=row['title'],
-                        abstract=row['abstract'],
-                        year=row['year']
-                    )
-                    for row in cur.fetchall()
-                ]
\ No newline at end of file
+                papers = [self._row_to_paper(row, fields) for row in cur.fetchall()]
+
+        # Abstracts etc. not selected here are fetched for all results on first access
+        defer_fields(papers, fields, self._fetch_paper_fields)
+        return papers
\ No newline at end of file
@@ -0,0 +1,266 @@
+import os
+import re
+import psycopg2
+from functools import lru_cache
+from dataclasses import dataclass
+from typing import List, Optional
+from contextlib import contextmanager
+from semantic_scholar.config import DatabaseConfig
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'migrations')
+MIGRATION_FILE_PATTERN = re.compile(r'^(\d+)_(\w+)\.sql$')
+NO_TRANSACTION_MARKER = '-- no-transaction'
+# Arbitrary key used to stop two migrators running at the same time
+MIGRATION_LOCK_KEY = 727_215_026
+
+
+class SchemaVersionError(RuntimeError):
+    """Raised when the database schema is not at the version the code expects."""
+
+
+class MigrationError(RuntimeError):
+    """Raised when a migration ran but left the schema in an unusable state."""
+
+
+CREATE_INDEX_PATTERN = re.compile(
+    r'^\s*CREATE\s+(?:UNIQUE\s+)?INDEX\s+(?:CONCURRENTLY\s+)?(?:IF\s+NOT\s+EXISTS\s+)?([\w."]+)',
+    re.IGNORECASE
+)
+DOLLAR_QUOTE_PATTERN = re.compile(r'\$(?:[A-Za-z_][A-Za-z0-9_]*)?\$')
+
+
+def split_statements(sql: str) -> List[str]:
+    """
+    Split SQL into statements on semicolons, ignoring those inside quoted strings,
+    quoted identifiers, dollar-quoted bodies and comments. Comments are dropped.
+    """
+    statements = []
+    current = []
+    i = 0
+    while i < len(sql):
+        char = sql[i]
+        if sql.startswith('--', i):
+            end = sql.find('\n', i)
+            i = len(sql) if end == -1 else end
+        elif sql.startswith('/*', i):
+            # Block comments nest in Postgres
+            depth = 0
+            while i < len(sql):
+                if sql.startswith('/*', i):
+                    depth += 1
+                    i += 2
+                elif sql.startswith('*/', i):
+                    depth -= 1
+                    i += 2
+                    if depth == 0:
+                        break
+                else:
+                    i += 1
+            current.append(' ')
+        elif char in ("'", '"'):
+            escapes = char == "'" and i > 0 and sql[i - 1] in 'Ee'
+            end = i + 1
+            while end < len(sql):
+                if escapes and sql[end] == '\\':
+                    end += 2
+                    continue
+                if sql[end] == char:
+                    # A doubled quote is an escaped quote, not the end
+                    if sql.startswith(char * 2, end):
+                        end += 2
+                        continue
+                    break
+                end += 1
+            current.append(sql[i:end + 1])
+            i = end + 1
+        elif char == '$' and DOLLAR_QUOTE_PATTERN.match(sql, i):
+            tag = DOLLAR_QUOTE_PATTERN.match(sql, i).group(0)
+            end = sql.find(tag, i + len(tag))
+            end = len(sql) if end == -1 else end + len(tag)
+            current.append(sql[i:end])
+            i = end
+        elif char == ';':
+            statements.append(''.join(current))
+            current = []
+            i += 1
+        else:
+            current.append(char)
+            i += 1
+    statements.append(''.join(current))
+    return [statement.strip() for statement in statements if statement.strip()]
+
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    sql: str
+
+    @property
+    def transactional(self) -> bool:
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        return not self.sql.lstrip().startswith(NO_TRANSACTION_MARKER)
+
+    @property
+    def statements(self) -> List[str]:
+        return split_statements(self.sql)
+
+    @property
+    def created_indexes(self) -> List[str]:
+        """Names of the indexes this migration creates, without any schema prefix."""
+        names = []
+        for statement in self.statements:
+            match = CREATE_INDEX_PATTERN.match(statement)
+            if match:
+                names.append(match.group(1).split('.')[-1].strip('"'))
+        return names
+
+
+def load_migrations(directory: str = MIGRATIONS_DIR) -> List[Migration]:
+    """Load migration files from the directory, ordered by version."""
+    migrations = []
+    for filename in os.listdir(directory):
+        match = MIGRATION_FILE_PATTERN.match(filename)
+        if match is None:
+            continue
+        with open(os.path.join(directory, filename)) as f:
+            migrations.append(Migration(
+                version=int(match.group(1)),
+                name=match.group(2),
+                sql=f.read()
+            ))
+    migrations.sort(key=lambda migration: migration.version)
+
+    versions = [migration.version for migration in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"Duplicate migration versions in {directory}")
+    return migrations
+
+
+@lru_cache(maxsize=None)
+def latest_version(directory: str = MIGRATIONS_DIR) -> int:
+    migrations = load_migrations(directory)
+    return migrations[-1].version if migrations else 0
+
+
+class SchemaMigrator:
+    def __init__(self, config: DatabaseConfig, directory: str = MIGRATIONS_DIR):
+        """
+        Initialize with a DatabaseConfig instance and the directory holding migration files
+        """
+        self._config = config
+        self._directory = directory
+
+    @contextmanager
+    def _get_connection(self):
+        conn = psycopg2.connect(self._config.dsn)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def current_version(self) -> int:
+        """Return the applied schema version, or 0 if no migrations have been run."""
+        with self._get_connection() as conn:
+            return self._current_version(conn)
+
+    def _current_version(self, conn) -> int:
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass('schema_version')")
+            if cur.fetchone()[0] is None:
+                return 0
+            cur.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+            return cur.fetchone()[0]
+
+    def migrate(self, target: Optional[int] = None) -> List[Migration]:
+        """
+        Apply pending migrations up to target (or the latest), returning those applied.
+        """
+        migrations = load_migrations(self._directory)
+        applied = []
+        with self._get_connection() as conn:
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_KEY,))
+                try:
+                    cur.execute("""
+                        CREATE TABLE IF NOT EXISTS schema_version (
+                            version INTEGER PRIMARY KEY,
+                            name TEXT NOT NULL,
+                            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                        )
+                    """)
+                    current = self._current_version(conn)
+                    for migration in migrations:
+                        if migration.version <= current:
+                            continue
+                        if target is not None and migration.version > target:
+                            break
+                        self._apply(conn, migration)
+                        applied.append(migration)
+                finally:
+                    cur.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_KEY,))
+        return applied
+
+    def _apply(self, conn, migration: Migration) -> None:
+        print(f"Applying migration {migration.version:04d}_{migration.name}")
+        with conn.cursor() as cur:
+            if migration.transactional:
+                cur.execute("BEGIN")
+                try:
+                    for statement in migration.statements:
+                        cur.execute(statement)
+                    self._record(cur, migration)
+                    cur.execute("COMMIT")
+                except Exception:
+                    cur.execute("ROLLBACK")
+                    raise
+            else:
+                # Statements must be idempotent, since a failure part way
+                # through leaves the earlier ones applied
+                for statement in migration.statements:
+                    cur.execute(statement)
+                self._check_indexes_valid(cur, migration)
+                self._record(cur, migration)
+
+    def _check_indexes_valid(self, cur, migration: Migration) -> None:
+        # A failed CREATE INDEX CONCURRENTLY leaves an INVALID index behind, which
+        # IF NOT EXISTS then skips on a retry, so refuse to record the migration.
+        # Only this migration's indexes are checked, since other sessions may be
+        # building indexes of their own concurrently.
+        names = migration.created_indexes
+        if not names:
+            return
+        cur.execute("""
+            SELECT c.relname
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE NOT i.indisvalid AND n.nspname = current_schema() AND c.relname = ANY(%s)
+            ORDER BY c.relname
+        """, (names,))
+        invalid = [row[0] for row in cur.fetchall()]
+        if invalid:
+            raise MigrationError(
+                f"Migration {migration.version:04d}_{migration.name} left invalid indexes {invalid}; "
+                f"drop them with DROP INDEX CONCURRENTLY and run the migration again"
+            )
+
+    def _record(self, cur, migration: Migration) -> None:
+        cur.execute(
+            "INSERT INTO schema_version (version, name) VALUES (%s, %s)",
+            (migration.version, migration.name)
+        )
+
+    def check(self, expected: Optional[int] = None) -> None:
+        """
+        Raise SchemaVersionError unless the database is at the expected version.
+        """
+        if expected is None:
+            expected = latest_version(self._directory)
+        current = self.current_version()
+        if current < expected:
+            raise SchemaVersionError(
+                f"Database schema is at version {current} but version {expected} is required; "
+                f"run 'python -m semantic_scholar.migrate'"
+            )
@@ -1,5 +1,6 @@
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import List
 
 @dataclass
 class DatabaseConfig:
@@ -8,6 +9,16 @@ class DatabaseConfig:
     name: str
     user: str
     password: str
+    # Read replicas; reads are spread over these, writes always go to the primary above
+    replica_dsns: List[str] = field(default_factory=list)
+    # Seconds a replica may lag, or go without hearing from the primary,
+    # before reads fall back to the primary
+    max_replica_lag: float = 5.0
+    # Seconds between replica lag checks
+    replica_check_interval: float = 1.0
+    # Read from replica DSNs that are not standbys. Only for test setups that use
+    # an independent Postgres instance in place of a real replica.
+    allow_standalone_replicas: bool = False
 
     @property
     def dsn(self) -> str:
@@ -15,10 +26,14 @@ class DatabaseConfig:
 
     @classmethod
     def from_env(cls) -> 'DatabaseConfig':
+        replica_dsns = os.getenv('POSTGRES_REPLICA_DSNS', '')
         return cls(
             host=os.getenv('POSTGRES_HOST', 'localhost'),
             port=int(os.getenv('POSTGRES_PORT', '5432')),
             name=os.getenv('POSTGRES_DB', 'papers'),
             user=os.getenv('POSTGRES_USER', 'postgres'),
-            password=os.getenv('POSTGRES_PASSWORD', 'postgres')
-        )
\ No newline at end of file
+            password=os.getenv('POSTGRES_PASSWORD', 'postgres'),
+            replica_dsns=[dsn.strip() for dsn in replica_dsns.split(';') if dsn.strip()],
+            max_replica_lag=float(os.getenv('POSTGRES_MAX_REPLICA_LAG', '5.0')),
+            replica_check_interval=float(os.getenv('POSTGRES_REPLICA_CHECK_INTERVAL', '1.0'))
+        )
@@ -1,10 +1,121 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+# Fields that may be left out of a query and fetched on first access.
+# corpus_id and title are always loaded.
+DEFERRABLE_FIELDS = ('abstract', 'year')
+
+# Fetches the given fields for a batch of corpus IDs, keyed by corpus ID
+FieldFetcher = Callable[[List[int], List[str]], Dict[int, Dict[str, Any]]]
+
+
+class DeferrableField:
+    """
+    Descriptor for a Paper field that may not have been loaded yet.
+    Reading it loads the pending fields of its batch; assigning it stops it being pending.
+    """
+    def __set_name__(self, owner, name):
+        self._name = name
+
+    def __get__(self, paper, owner=None):
+        if paper is None:
+            return None  # The dataclass default
+        if self._name in paper._pending_fields:
+            paper._deferred_loader.load()
+        return paper.__dict__.get(self._name)
+
+    def __set__(self, paper, value):
+        paper.__dict__[self._name] = value
+        if self._name in paper._pending_fields:
+            paper._pending_fields.discard(self._name)
+
 
 @dataclass
 class Paper:
     corpus_id: int  # The unique identifier for papers (int64)
     title: str
-    abstract: Optional[str] = None
-    year: Optional[int] = None
\ No newline at end of file
+    abstract: Optional[str] = DeferrableField()
+    year: Optional[int] = DeferrableField()
+
+    # Not dataclass fields: set by DeferredFieldLoader when fields were not selected
+    _deferred_loader = None
+    _pending_fields = frozenset()
+
+    def deferred_fields(self) -> Set[str]:
+        """Return the fields that have not been loaded yet."""
+        return set(self._pending_fields)
+
+    def _loaded_values(self):
+        # Field values as stored, without loading anything deferred
+        return (self.corpus_id, self.title) + tuple(
+            None if field in self._pending_fields else self.__dict__.get(field)
+            for field in DEFERRABLE_FIELDS
+        )
+
+    def __repr__(self):
+        values = ', '.join(
+            f"{field}=<deferred>" if field in self._pending_fields else f"{field}={self.__dict__.get(field)!r}"
+            for field in DEFERRABLE_FIELDS
+        )
+        return f"Paper(corpus_id={self.corpus_id!r}, title={self.title!r}, {values})"
+
+    def __copy__(self):
+        paper = self.__class__.__new__(self.__class__)
+        paper.__dict__.update(self.__dict__)
+        if self._pending_fields:
+            # The copy needs its own pending fields, loaded with the rest of the batch
+            paper._pending_fields = set(self._pending_fields)
+            self._deferred_loader.add(paper)
+        return paper
+
+    def __deepcopy__(self, memo):
+        # Field values are immutable, and the loader must stay shared with the batch
+        return self.__copy__()
+
+    def __eq__(self, other):
+        # Compares what has been loaded, so never triggers a fetch
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self._loaded_values() == other._loaded_values()
+                and self._pending_fields == other._pending_fields)
+
+
+class DeferredFieldLoader:
+    def __init__(self, papers: Sequence[Paper], fields: Iterable[str], fetch: FieldFetcher):
+        """
+        Defer fields for a list of papers. The first access to a deferred field on
+        any of the papers fetches every still-pending field for the whole list in one call.
+        """
+        self._papers = list(papers)
+        self._fetch = fetch
+        for paper in self._papers:
+            paper._deferred_loader = self
+            paper._pending_fields = set(fields)
+
+    def add(self, paper: Paper) -> None:
+        """Load paper's pending fields along with the rest of the batch."""
+        paper._deferred_loader = self
+        self._papers.append(paper)
+
+    def load(self) -> None:
+        papers = [paper for paper in self._papers if paper._pending_fields]
+        if not papers:
+            return
+        pending = set().union(*(paper._pending_fields for paper in papers))
+        fields = [field for field in DEFERRABLE_FIELDS if field in pending]
+        # Copies share a corpus ID with their original, so fetch each ID once
+        corpus_ids = list(dict.fromkeys(paper.corpus_id for paper in papers))
+        values = self._fetch(corpus_ids, fields)
+        for paper in papers:
+            # Fields assigned since the papers were loaded are no longer pending
+            for field in list(paper._pending_fields):
+                setattr(paper, field, values.get(paper.corpus_id, {}).get(field))
+
+
+def defer_fields(papers: Sequence[Paper], loaded_fields: Iterable[str], fetch: FieldFetcher) -> None:
+    """Attach a DeferredFieldLoader for every deferrable field not in loaded_fields."""
+    loaded_fields = list(loaded_fields)
+    deferred = [field for field in DEFERRABLE_FIELDS if field not in loaded_fields]
+    if papers and deferred:
+        DeferredFieldLoader(papers, deferred, fetch)
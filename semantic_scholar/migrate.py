@@ -0,0 +1,23 @@
+import argparse
+from dotenv import load_dotenv
+from semantic_scholar.adapters.schema_migrator import SchemaMigrator
+from semantic_scholar.config import DatabaseConfig
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Apply pending database schema migrations")
+    parser.add_argument('--target', type=int, default=None,
+                        help="Migrate up to this version instead of the latest")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    migrator = SchemaMigrator(DatabaseConfig.from_env())
+    applied = migrator.migrate(args.target)
+    if applied:
+        print(f"Applied {len(applied)} migration(s); schema is at version {applied[-1].version}")
+    else:
+        print(f"Schema is up to date at version {migrator.current_version()}")
+
+
+if __name__ == '__main__':
+    main()
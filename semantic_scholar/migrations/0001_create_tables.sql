@@ -0,0 +1,33 @@
+-- Create papers table with corpus_id as primary key
+CREATE TABLE IF NOT EXISTS papers (
+    corpus_id BIGINT PRIMARY KEY,
+    title TEXT NOT NULL,
+    abstract TEXT,
+    year INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Create paperids table to store paper ID mappings
+CREATE TABLE IF NOT EXISTS paperids (
+    sha TEXT NOT NULL,
+    corpus_id BIGINT NOT NULL,
+    is_primary BOOLEAN NOT NULL,
+    CONSTRAINT paperids_pk UNIQUE (sha),
+    FOREIGN KEY (corpus_id) REFERENCES papers(corpus_id) ON DELETE CASCADE
+);
+
+-- Create authors table
+CREATE TABLE IF NOT EXISTS authors (
+    author_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL
+);
+
+-- Create wrote table for the many-to-many relationship
+CREATE TABLE IF NOT EXISTS wrote (
+    author_id TEXT NOT NULL,
+    corpus_id BIGINT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (author_id, corpus_id),
+    FOREIGN KEY (author_id) REFERENCES authors(author_id) ON DELETE CASCADE,
+    FOREIGN KEY (corpus_id) REFERENCES papers(corpus_id) ON DELETE CASCADE
+);
@@ -0,0 +1,5 @@
+-- no-transaction
+-- Create indexes for efficient lookups without blocking writes
+CREATE INDEX CONCURRENTLY IF NOT EXISTS paperids_corpus_id_idx ON paperids (corpus_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS wrote_author_id_idx ON wrote (author_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS wrote_corpus_id_idx ON wrote (corpus_id);
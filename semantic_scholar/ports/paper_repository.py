@@ -1,15 +1,42 @@
-from typing import List, Optional, Dict, Tuple
-from semantic_scholar.domain.paper import Paper
+from contextlib import nullcontext
+from typing import Any, Iterable, List, Optional, Dict, Tuple
+from semantic_scholar.domain.paper import Paper, DEFERRABLE_FIELDS, defer_fields
 from semantic_scholar.domain.paper_id import PaperId
 from semantic_scholar.domain.author import Author
 from semantic_scholar.domain.wrote import Wrote
 
+# Optional fields callers can ask for; corpus_id and title are always loaded.
+# 'authors' controls whether authors are fetched from the API along with the papers;
+# repositories that store authors separately ignore it.
+PAPER_FIELDS = DEFERRABLE_FIELDS + ('authors',)
+
+
+def validate_fields(fields: Optional[Iterable[str]]) -> List[str]:
+    """Return the requested fields as a list, or all of PAPER_FIELDS if fields is None."""
+    if fields is None:
+        return list(PAPER_FIELDS)
+    fields = list(fields)
+    unknown = [field for field in fields if field not in PAPER_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown paper fields {unknown}; expected some of {list(PAPER_FIELDS)}")
+    return fields
+
+
 class PaperRepository:
     def __init__(self, api_client):
         self.api_client = api_client
 
-    def search_papers(self, query: str, limit: int = 10) -> List[Paper]:
-        response = self.api_client.search_papers(query, limit)
+    def search_papers(self, query: str, limit: int = 10, fields: Optional[Iterable[str]] = None) -> List[Paper]:
+        """Search for papers, loading only the given optional fields.
+
+        Args:
+            query: Search query
+            limit: Maximum number of papers to return
+            fields: Optional fields to load, from PAPER_FIELDS. None loads all of them.
+                Paper fields left out are fetched on first access.
+        """
+        fields = validate_fields(fields)
+        response = self.api_client.search_papers(query, limit, fields)
         papers = []
         paper_ids = {}
         authors_data = {}
@@ -49,14 +76,26 @@ class PaperRepository:
                             i  # Position in the author list
                         ))
 
+        # Fields that were not requested are fetched in one batch when first accessed
+        defer_fields(papers, fields, self._fetch_paper_fields)
+
         # Save the papers, their IDs, and authors
         if papers:
             self.save_papers(papers, paper_ids, authors_data)
 
         return papers
 
+    def _fetch_paper_fields(self, corpus_ids: List[int], fields: List[str]) -> Dict[int, Dict[str, Any]]:
+        """Fetch deferred fields for a batch of papers, keyed by corpus ID."""
+        response = self.api_client.get_papers(corpus_ids, fields)
+        return {
+            paper_data['corpusId']: {field: paper_data.get(field) for field in fields}
+            for paper_data in response
+            if paper_data
+        }
+
     def save_papers(self, papers: List[Paper], paper_ids: Dict[int, List[Tuple[str, bool]]] = None,
-                   authors: Dict[int, List[Tuple[str, str, int]]] = None) -> None:
+                   authors: Dict[int, List[Tuple[str, str, int]]] = None) -> Optional[str]:
         """Save a list of papers and their associated paper IDs and authors to the repository.
 
         Args:
@@ -64,21 +103,33 @@ class PaperRepository:
             paper_ids: Dictionary mapping corpus_id to a list of (sha, is_primary) tuples
             authors: Dictionary mapping corpus_id to a list of (author_id, name, position) tuples
 
+        Returns:
+            A write position that can be passed to read_after() to read the saved papers
+            back from replicas, or None if the repository has no replicas to wait for.
+
+        Deferred fields that have not been loaded should be left unchanged.
         This method should be implemented by concrete repository classes.
-        The base implementation does nothing.
+        The base implementation does nothing and returns None.
+        """
+        return None
+
+    def read_after(self, lsn: Optional[str]):
+        """Context manager: reads inside it see the write that returned lsn from save_papers.
+
+        The base implementation has no replicas to wait for, so does nothing.
         """
-        pass
+        return nullcontext()
 
-    def get_paper_by_id(self, paper_id: str) -> Optional[Paper]:
-        """Retrieve a paper by its paper ID (sha).
+    def get_paper_by_id(self, paper_id: str, fields: Optional[Iterable[str]] = None) -> Optional[Paper]:
+        """Retrieve a paper by its paper ID (sha), loading only the given optional fields.
 
         This method should be implemented by concrete repository classes.
         The base implementation returns None.
         """
         return None
 
-    def get_paper_by_corpus_id(self, corpus_id: int) -> Optional[Paper]:
-        """Retrieve a paper by its corpus ID.
+    def get_paper_by_corpus_id(self, corpus_id: int, fields: Optional[Iterable[str]] = None) -> Optional[Paper]:
+        """Retrieve a paper by its corpus ID, loading only the given optional fields.
 
         This method should be implemented by concrete repository classes.
         The base implementation returns None.
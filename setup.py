@@ -4,6 +4,9 @@ setup(
     name="semantic_scholar",
     version="0.1",
     packages=find_packages(),
+    package_data={
+        "semantic_scholar": ["migrations/*.sql"],
+    },
     install_requires=[
         "requests>=2.28.0",
     ],
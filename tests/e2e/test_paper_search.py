@@ -23,4 +23,40 @@ class TestPaperSearch:
             assert hasattr(paper, 'corpus_id')
             assert hasattr(paper, 'title')
             assert isinstance(paper.title, str)
-            assert isinstance(paper.corpus_id, int)
\ No newline at end of file
+            assert isinstance(paper.corpus_id, int)
+
+    def test_search_papers_with_projected_fields(self):
+        # Arrange
+        repository = PaperRepository(SemanticScholarApiClient())
+
+        # Act
+        papers = repository.search_papers("machine learning", limit=3, fields=["year"])
+
+        # Assert
+        assert len(papers) > 0
+        for paper in papers:
+            assert isinstance(paper.title, str)
+            assert paper.deferred_fields() == {"abstract"}
+
+        # Reading a deferred field fetches it for every result through the batch endpoint
+        with patch.object(SemanticScholarApiClient, "get_papers",
+                          wraps=repository.api_client.get_papers) as get_papers:
+            abstracts = [paper.abstract for paper in papers]
+            assert get_papers.call_count == 1
+        assert all(paper.deferred_fields() == set() for paper in papers)
+        assert any(isinstance(abstract, str) for abstract in abstracts)
+
+    def test_get_papers_splits_large_batches(self):
+        # Arrange
+        client = SemanticScholarApiClient()
+        corpus_ids = list(range(1001))
+
+        # Act
+        with patch.object(client, "_make_request",
+                          side_effect=lambda method, url, params, json: [{"corpusId": int(i.split(":")[1])} for i in json["ids"]]) as make_request:
+            papers = client.get_papers(corpus_ids, ["abstract"])
+
+        # Assert
+        assert make_request.call_count == 3
+        assert [len(call.args[3]["ids"]) for call in make_request.call_args_list] == [500, 500, 1]
+        assert [paper["corpusId"] for paper in papers] == corpus_ids
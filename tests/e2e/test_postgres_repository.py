@@ -1,11 +1,13 @@
 import pytest
 import os
+import copy
 from dotenv import load_dotenv
 from semantic_scholar.adapters.postgres_repository import PostgresPaperRepository
 from semantic_scholar.domain.paper import Paper
 from semantic_scholar.domain.paper_id import PaperId
 from semantic_scholar.domain.author import Author
 from semantic_scholar.config import DatabaseConfig
+from semantic_scholar.adapters.schema_migrator import SchemaMigrator, SchemaVersionError, load_migrations, latest_version
 
 # Load environment variables from .env file
 load_dotenv()
@@ -21,24 +23,40 @@ def db_config():
     )
 
 @pytest.fixture
-def repository(db_config):  # Use db_config fixture directly
+def migrator(db_config):
     # Clean up before tests to start with a fresh state
-    repo = PostgresPaperRepository(db_config)
-    with repo._get_connection() as conn:
+    migrator = SchemaMigrator(db_config)
+    with migrator._get_connection() as conn:
         with conn.cursor() as cur:
             cur.execute("DROP TABLE IF EXISTS wrote")
             cur.execute("DROP TABLE IF EXISTS authors")
             cur.execute("DROP TABLE IF EXISTS paperids")
             cur.execute("DROP TABLE IF EXISTS papers")
+            cur.execute("DROP TABLE IF EXISTS schema_version")
         conn.commit()
+    return migrator
 
-    # Re-initialize the repository to create fresh tables
-    repo = PostgresPaperRepository(db_config)
+@pytest.fixture
+def repository(db_config, migrator):
+    # Run the migrations to create fresh tables
+    migrator.migrate()
 
     # Return the repository for the test to use
-    return repo
+    return PostgresPaperRepository(db_config)
     # No cleanup after tests - tables are left for inspection
 
+def test_repository_requires_migrated_schema(db_config, migrator):
+    with pytest.raises(SchemaVersionError):
+        PostgresPaperRepository(db_config)
+
+def test_migrate_is_idempotent(migrator):
+    applied = migrator.migrate()
+    assert [m.version for m in applied] == [m.version for m in load_migrations()]
+    assert migrator.current_version() == latest_version()
+
+    assert migrator.migrate() == []
+    assert migrator.current_version() == latest_version()
+
 def test_save_and_retrieve_paper(repository):
     # Arrange
     paper = Paper(
@@ -130,4 +148,90 @@ def test_search_papers(repository):
     authors_list = repository.get_authors_for_paper(1)
     assert len(authors_list) == 1
     assert authors_list[0].author_id == "author1"
-    assert authors_list[0].name == "Author One"
\ No newline at end of file
+    assert authors_list[0].name == "Author One"
+
+def test_search_papers_with_deferred_abstract(repository):
+    # Arrange
+    papers = [
+        Paper(corpus_id=1, title="Machine Learning Basics", abstract="A paper about ML", year=2023),
+        Paper(corpus_id=2, title="Machine Learning Advanced", abstract="More about ML", year=2024)
+    ]
+    repository.save_papers(papers)
+
+    # Act
+    results = repository.search_papers("machine learning", fields=['year'])
+
+    # Assert
+    assert len(results) == 2
+    assert all(result.deferred_fields() == {'abstract'} for result in results)
+    results_by_id = {result.corpus_id: result for result in results}
+    assert results_by_id[1].year == 2023
+
+    # Accessing one abstract loads the abstracts of the whole result list
+    assert results_by_id[1].abstract == "A paper about ML"
+    assert results_by_id[2].deferred_fields() == set()
+    assert results_by_id[2].abstract == "More about ML"
+
+
+def test_save_papers_leaves_deferred_fields_unchanged(repository):
+    # Arrange
+    repository.save_papers([Paper(corpus_id=1, title="Old Title", abstract="Kept Abstract", year=2023)])
+    paper = repository.get_paper_by_corpus_id(1, fields=[])
+
+    # Act
+    paper.title = "New Title"
+    repository.save_papers([paper])
+
+    # Assert
+    retrieved_paper = repository.get_paper_by_corpus_id(1)
+    assert retrieved_paper.title == "New Title"
+    assert retrieved_paper.abstract == "Kept Abstract"
+    assert retrieved_paper.year == 2023
+
+
+def test_assigning_deferred_field_keeps_the_assignment(repository):
+    # Arrange
+    repository.save_papers([
+        Paper(corpus_id=1, title="Memory First", abstract="Stored Abstract", year=2023),
+        Paper(corpus_id=2, title="Memory Second", abstract="Other Abstract", year=2024)
+    ])
+    results = {paper.corpus_id: paper for paper in repository.search_papers("memory", fields=['year'])}
+
+    # Act
+    results[1].abstract = "User Edit"
+
+    # Assert: only the assigned paper stops being pending
+    assert results[1].deferred_fields() == set()
+    assert results[2].deferred_fields() == {'abstract'}
+    assert results[2].abstract == "Other Abstract"
+    assert results[1].abstract == "User Edit"
+
+    repository.save_papers([results[1]])
+    assert repository.get_paper_by_corpus_id(1).abstract == "User Edit"
+
+
+def test_search_papers_accepts_authors_field(repository):
+    # Arrange
+    repository.save_papers([Paper(corpus_id=1, title="Machine Learning Basics", abstract="ML", year=2023)])
+
+    # Act
+    results = repository.search_papers("machine learning", fields=['year', 'authors'])
+
+    # Assert
+    assert len(results) == 1
+    assert results[0].deferred_fields() == {'abstract'}
+
+
+
+def test_copy_of_deferred_paper_loads_its_own_fields(repository):
+    # Arrange
+    repository.save_papers([Paper(corpus_id=1, title="Memory First", abstract="Stored Abstract", year=2023)])
+    paper = repository.get_paper_by_corpus_id(1, fields=['year'])
+
+    # Act
+    paper_copy = copy.copy(paper)
+
+    # Assert
+    assert paper_copy.abstract == "Stored Abstract"
+    assert paper_copy.deferred_fields() == set()
+    assert paper.abstract == "Stored Abstract"
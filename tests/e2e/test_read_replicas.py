@@ -0,0 +1,326 @@
+import pytest
+import os
+import contextvars
+import psycopg2
+from dotenv import load_dotenv
+from semantic_scholar.adapters.connection_router import (
+    ConnectionRouter, PRIMARY_LSN_QUERY, REPLAY_LSN_QUERY, REPLICA_STATUS_QUERY, _read_after_lsns
+)
+from semantic_scholar.adapters.postgres_repository import PostgresPaperRepository
+from semantic_scholar.adapters.schema_migrator import SchemaMigrator
+from semantic_scholar.domain.paper import Paper
+from semantic_scholar.config import DatabaseConfig
+
+# Load environment variables from .env file
+load_dotenv()
+
+# These tests use a second, independent Postgres instance as the "replica",
+# so anything written to the primary is visible only when a read goes there
+REPLICA_PORT = os.getenv('TEST_REPLICA_PORT')
+requires_replica = pytest.mark.skipif(REPLICA_PORT is None, reason="TEST_REPLICA_PORT is not set")
+
+@pytest.fixture(autouse=True)
+def fresh_read_context():
+    # Each test starts without a read-your-writes position from an earlier test
+    token = _read_after_lsns.set({})
+    yield
+    _read_after_lsns.reset(token)
+
+def make_config(port, **kwargs):
+    return DatabaseConfig(
+        host=os.getenv('POSTGRES_HOST', 'localhost'),
+        port=int(port),
+        name=os.getenv('TEST_DB', 'papers_test'),
+        user=os.getenv('POSTGRES_USER', 'postgres'),
+        password=os.getenv('POSTGRES_PASSWORD', 'postgres'),
+        **kwargs
+    )
+
+def reset_schema(config):
+    migrator = SchemaMigrator(config)
+    with migrator._get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("DROP TABLE IF EXISTS wrote, authors, paperids, papers, schema_version")
+        conn.commit()
+    migrator.migrate()
+
+@pytest.fixture
+def replica_config():
+    config = make_config(REPLICA_PORT)
+    reset_schema(config)
+    return config
+
+@pytest.fixture
+def primary_config(replica_config):
+    return make_config(
+        os.getenv('POSTGRES_PORT', '5432'),
+        replica_dsns=[replica_config.dsn],
+        max_replica_lag=0.5,
+        allow_standalone_replicas=True
+    )
+
+@requires_replica
+def test_reads_after_write_stick_to_primary(primary_config):
+    # Arrange
+    reset_schema(primary_config)
+    repository = PostgresPaperRepository(primary_config)
+
+    # Act
+    lsn = repository.save_papers([Paper(corpus_id=1, title="Written to primary")])
+
+    # Assert: the standalone "replica" never replays the write, so reads go to the primary
+    assert repository.get_paper_by_corpus_id(1).title == "Written to primary"
+
+    # Another caller without the write position reads from the replica
+    assert contextvars.Context().run(repository.get_paper_by_corpus_id, 1) is None
+    with repository.read_after(lsn):
+        assert repository.get_paper_by_corpus_id(1).title == "Written to primary"
+
+@requires_replica
+def test_reads_go_to_replica(primary_config, replica_config):
+    # Arrange
+    reset_schema(primary_config)
+    # Seed in a copy of the context, so this test's reads carry no write position
+    contextvars.copy_context().run(
+        PostgresPaperRepository(replica_config).save_papers, [Paper(corpus_id=1, title="Only on replica")]
+    )
+
+    # Act
+    repository = PostgresPaperRepository(primary_config)
+    paper = repository.get_paper_by_corpus_id(1)
+
+    # Assert
+    assert paper is not None
+    assert paper.title == "Only on replica"
+
+def test_reads_fall_back_to_primary_when_replica_is_down():
+    # Arrange
+    config = make_config(os.getenv('POSTGRES_PORT', '5432'), replica_dsns=[make_config(1).dsn])
+    reset_schema(config)
+    repository = PostgresPaperRepository(config)
+    with repository._get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("INSERT INTO papers (corpus_id, title) VALUES (1, 'On primary')")
+        conn.commit()
+
+    # Act
+    paper = repository.get_paper_by_corpus_id(1)
+
+    # Assert
+    assert paper is not None
+    assert paper.title == "On primary"
+
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeServer:
+    def __init__(self, name, in_recovery=True, lsn='0/10', replay_age=0.0, receiver_status='streaming'):
+        self.name = name
+        self.up = True
+        self.in_recovery = in_recovery
+        self.lsn = lsn  # Current WAL position on the primary, replay position on a replica
+        self.replay_age = replay_age
+        self.receiver_status = receiver_status
+        self.connects = 0
+
+
+class FakeCursor:
+    def __init__(self, server):
+        self._server = server
+        self._row = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, sql, params=None):
+        server = self._server
+        if sql in (PRIMARY_LSN_QUERY, REPLAY_LSN_QUERY):
+            self._row = (server.lsn,)
+        elif sql == REPLICA_STATUS_QUERY:
+            self._row = (server.in_recovery, server.lsn if server.in_recovery else None,
+                         server.replay_age, server.receiver_status)
+        else:
+            raise AssertionError(f"Unexpected query {sql}")
+
+    def fetchone(self):
+        return self._row
+
+
+class FakeConnection:
+    def __init__(self, server):
+        self.server = server
+
+    def cursor(self):
+        return FakeCursor(self.server)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def servers():
+    return {
+        'primary': FakeServer('primary', in_recovery=False),
+        'replica1': FakeServer('replica1'),
+        'replica2': FakeServer('replica2'),
+    }
+
+def make_router(servers, clock, primary='primary', replicas=('replica1', 'replica2'), **kwargs):
+    config = DatabaseConfig(host=primary, port=5432, name='papers', user='postgres', password='postgres',
+                            replica_dsns=list(replicas), max_replica_lag=5.0, replica_check_interval=1.0,
+                            **kwargs)
+
+    def connect(dsn):
+        server = servers[primary if dsn == config.dsn else dsn]
+        server.connects += 1
+        if not server.up:
+            raise psycopg2.OperationalError(f"{server.name} is down")
+        return FakeConnection(server)
+
+    return ConnectionRouter(config, clock=clock, connect=connect)
+
+@pytest.fixture
+def router(servers, clock):
+    return make_router(servers, clock)
+
+def read_from(router):
+    return router.connect_read().server.name
+
+def test_reads_rotate_round_robin(router):
+    assert [read_from(router) for _ in range(4)] == ['replica1', 'replica2', 'replica1', 'replica2']
+
+def test_writes_go_to_primary(router):
+    assert router.connect_write().server.name == 'primary'
+
+def test_lagging_replica_is_skipped_until_next_check(router, servers, clock):
+    # Arrange: replica1 is behind the primary and has not replayed anything for 10 seconds
+    servers['primary'].lsn = '0/20'
+    servers['replica1'].replay_age = 10.0
+
+    # Act / Assert
+    assert [read_from(router) for _ in range(3)] == ['replica2', 'replica2', 'replica2']
+    assert servers['replica1'].connects == 1  # The known lag is reused until the next check
+
+    # Once it catches up, the next check puts it back in rotation
+    servers['replica1'].lsn = '0/20'
+    clock.now += 1.0
+    assert sorted(read_from(router) for _ in range(2)) == ['replica1', 'replica2']
+
+def test_replica_with_disconnected_receiver_is_skipped(router, servers):
+    # Arrange: replay has caught up with what was received, but nothing is being received
+    servers['replica1'].receiver_status = None
+    servers['replica2'].receiver_status = 'stopping'
+
+    # Act / Assert
+    assert read_from(router) == 'primary'
+
+def test_idle_standby_stays_in_rotation(router, servers):
+    # Arrange: nothing has been written for a minute, but the replicas have replayed it all
+    servers['replica1'].replay_age = 60.0
+    servers['replica2'].replay_age = 60.0
+
+    # Act / Assert
+    assert sorted(read_from(router) for _ in range(2)) == ['replica1', 'replica2']
+
+def test_non_standby_replica_is_skipped(servers, clock):
+    # Arrange: replica1 is a promoted or misconfigured server
+    servers['replica1'].in_recovery = False
+    router = make_router(servers, clock)
+
+    # Act / Assert
+    assert [read_from(router) for _ in range(3)] == ['replica2', 'replica2', 'replica2']
+
+def test_standalone_replica_is_used_when_allowed(servers, clock):
+    # Arrange
+    servers['replica1'].in_recovery = False
+    router = make_router(servers, clock, replicas=['replica1'], allow_standalone_replicas=True)
+
+    # Act / Assert
+    assert read_from(router) == 'replica1'
+
+def test_down_replica_is_backed_off(router, servers, clock):
+    # Arrange
+    servers['replica1'].up = False
+
+    # Act / Assert
+    assert [read_from(router) for _ in range(3)] == ['replica2', 'replica2', 'replica2']
+    assert servers['replica1'].connects == 1
+
+    servers['replica1'].up = True
+    clock.now += 1.0
+    assert sorted(read_from(router) for _ in range(2)) == ['replica1', 'replica2']
+
+def test_reads_fall_back_to_primary_when_no_replica_is_usable(router, servers):
+    servers['replica1'].up = False
+    servers['replica2'].up = False
+
+    assert read_from(router) == 'primary'
+
+def test_reads_after_write_wait_for_replay(router, servers):
+    # Arrange: the write moves the primary past what the replicas have replayed
+    servers['primary'].lsn = '0/20'
+    lsn = router.record_write(FakeConnection(servers['primary']))
+
+    # Act / Assert: this caller reads from the primary
+    assert lsn == '0/20'
+    assert read_from(router) == 'primary'
+
+    # Other callers are not pinned to the primary
+    assert contextvars.Context().run(read_from, router) in ('replica1', 'replica2')
+
+    # Once a replica has replayed the write, this caller uses it, but not the other one
+    servers['replica1'].lsn = '0/20'
+    assert [read_from(router) for _ in range(2)] == ['replica1', 'replica1']
+
+def test_write_position_is_scoped_to_each_primary(servers, clock):
+    # Arrange: two routers for different primaries, used in the same context
+    servers['other'] = FakeServer('other', in_recovery=False, lsn='0/90')
+    servers['other_replica'] = FakeServer('other_replica', lsn='0/90')
+    router = make_router(servers, clock)
+    other_router = make_router(servers, clock, primary='other', replicas=['other_replica'])
+
+    # Act: a write through the other router moves only its own position
+    servers['other'].lsn = '0/A0'
+    other_router.record_write(FakeConnection(servers['other']))
+
+    # Assert
+    assert read_from(router) == 'replica1'
+    assert read_from(other_router) == 'other'
+
+    # And a write through the first router does not affect the other router's reads
+    servers['primary'].lsn = '0/20'
+    router.record_write(FakeConnection(servers['primary']))
+    servers['other_replica'].lsn = '0/A0'
+    assert read_from(router) == 'primary'
+    assert read_from(other_router) == 'other_replica'
+
+def test_from_env_reads_replica_settings(monkeypatch):
+    monkeypatch.setenv('POSTGRES_REPLICA_DSNS', 'host=replica1; host=replica2')
+    monkeypatch.setenv('POSTGRES_MAX_REPLICA_LAG', '2.5')
+    monkeypatch.setenv('POSTGRES_REPLICA_CHECK_INTERVAL', '0.5')
+
+    config = DatabaseConfig.from_env()
+
+    assert config.replica_dsns == ['host=replica1', 'host=replica2']
+    assert config.max_replica_lag == 2.5
+    assert config.replica_check_interval == 0.5